@@ -2,10 +2,15 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from config import config
+from app.events import AnnouncementBroker
+from app.assets import Assets
+from app.compression import compress_response
 import os
 
 db = SQLAlchemy()
 login_manager = LoginManager()
+broker = AnnouncementBroker()
+assets = Assets()
 
 def create_app(config_name='development'):
     """Application factory pattern."""
@@ -21,6 +26,11 @@ def create_app(config_name='development'):
     login_manager.login_view = 'auth.login'
     login_manager.login_message = 'Please log in to access this page.'
     login_manager.login_message_category = 'info'
+    broker.init_app(app)
+    assets.init_app(app)
+    
+    # Compress HTML and JSON responses from every blueprint
+    app.after_request(compress_response)
 
     # Ensure database tables exist once app context is available (Flask 3 removed before_first_request)
     try:
@@ -38,6 +48,7 @@ def create_app(config_name='development'):
     from app.routes.teacher import teacher_bp
     from app.routes.admin import admin_bp
     from app.routes.announcements import announcements_bp
+    from app.routes.jobs import jobs_bp
     
     app.register_blueprint(auth_bp)
     app.register_blueprint(main_bp)
@@ -46,5 +57,15 @@ def create_app(config_name='development'):
     app.register_blueprint(teacher_bp, url_prefix='/teacher')
     app.register_blueprint(admin_bp, url_prefix='/admin')
     app.register_blueprint(announcements_bp, url_prefix='/announcements')
+    app.register_blueprint(jobs_bp, url_prefix='/jobs')
+    
+    # Background jobs: handlers and the `flask jobs work` command
+    from app import tasks  # noqa: F401 - registers job handlers
+    from app.jobs import jobs_cli
+    app.cli.add_command(jobs_cli)
+    
+    # One-off data migrations (`flask data ...`)
+    from app.commands import data_cli
+    app.cli.add_command(data_cli)
     
     return app
@@ -0,0 +1,284 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import click
+from flask import request, send_file, url_for, abort, current_app
+from flask.cli import AppGroup
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; .br variants are skipped without it
+    brotli = None
+
+ONE_YEAR = 365 * 24 * 60 * 60
+
+assets_cli = AppGroup('assets', help='Static asset pipeline commands.')
+
+
+CSS_SKIPPED = re.compile(r'/\*.*?\*/|"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'', re.S)
+CSS_STATEMENT_END = re.compile(r'[{;}]')
+
+
+def minify_css(text):
+    """Strip comments and insignificant whitespace from a stylesheet.
+
+    Quoted strings are copied verbatim. Whitespace around ``:`` is only
+    removed in declarations and at-rule conditions; in a selector
+    (``.a :hover``) it is a descendant combinator.
+    """
+    strings = []
+
+    def skip(match):
+        if match.group().startswith('/*'):
+            return ''  # comments are not whitespace: .a/**/.b is .a.b
+        strings.append(match.group())
+        return f'\0{len(strings) - 1}\0'
+
+    def colon(match):
+        end = CSS_STATEMENT_END.search(match.string, match.end())
+        if end is None or end.group() != '{':
+            return ':'
+        # A selector, unless it is a media feature such as @media (max-width: 768px)
+        prelude = re.split(r'[{;}]', match.string[:match.start()])[-1]
+        if prelude.lstrip().startswith('@') and prelude.rfind('(') > prelude.rfind(')'):
+            return ':'
+        return match.group()
+
+    text = CSS_SKIPPED.sub(skip, text)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\s*([{};,>])\s*', r'\1', text)
+    text = re.sub(r'\s*:\s*', colon, text)
+    text = text.replace(';}', '}').strip()
+    return re.sub(r'\0(\d+)\0', lambda match: strings[int(match.group(1))], text)
+
+
+JS_REGEX_KEYWORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+                     'throw', 'case', 'do', 'else', 'yield', 'await'}
+
+
+def _js_regex_allowed(text, i):
+    """Whether a ``/`` at ``i`` starts a regular expression rather than a division."""
+    k = i - 1
+    while k >= 0 and text[k].isspace():
+        k -= 1
+    if k < 0:
+        return True
+    if text[k].isalnum() or text[k] in '_$':
+        start = k
+        while start > 0 and (text[start - 1].isalnum() or text[start - 1] in '_$'):
+            start -= 1
+        return text[start:k + 1] in JS_REGEX_KEYWORDS
+    return text[k] not in ')]\'"`'
+
+
+def _js_literal_end(text, i):
+    """End of the string or regex literal starting at ``i`` (None if it is not one)."""
+    quote = '/' if text[i] == '/' else text[i]
+    j, in_class = i + 1, False
+    while j < len(text):
+        c = text[j]
+        if c == '\\':
+            j += 2
+            continue
+        if c == '\n':
+            return None if quote == '/' else j
+        if quote == '/' and c in '[]':
+            in_class = c == '['
+        elif c == quote and not in_class:
+            j += 1
+            if quote == '/':
+                while j < len(text) and (text[j].isalnum() or text[j] == '_'):
+                    j += 1
+            return j
+        j += 1
+    return len(text)
+
+
+def _split_js(text):
+    """Split a script into ('code' | 'literal' | 'comment', text) pieces.
+
+    Strings, template literal text and regular expression literals are
+    literals and must be kept verbatim; ``${...}`` inside templates is code.
+    """
+    pieces, start, i = [], 0, 0
+    templates, depth = [], 0  # brace depth at each open ${ ... }
+    while i < len(text):
+        c = text[i]
+        end = kind = None
+        if c == '`' or (c == '}' and templates and templates[-1] == depth):
+            if c == '}':
+                templates.pop()
+            end = i + 1
+            while end < len(text) and text[end] != '`' and not text.startswith('${', end):
+                end += 2 if text[end] == '\\' else 1
+            if text.startswith('${', end):
+                templates.append(depth)
+                end += 2
+            else:
+                end += 1
+            kind = 'literal'
+        elif text.startswith('//', i):
+            end = text.find('\n', i)
+            end, kind = (len(text) if end < 0 else end), 'comment'
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            end, kind = (len(text) if end < 0 else end + 2), 'comment'
+        elif c in '\'"' or (c == '/' and _js_regex_allowed(text, i)):
+            end, kind = _js_literal_end(text, i), 'literal'
+        elif c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+        if end is None:
+            i += 1
+            continue
+        if start < i:
+            pieces.append(('code', text[start:i]))
+        pieces.append((kind, text[i:end]))
+        start = i = end
+    if start < len(text):
+        pieces.append(('code', text[start:]))
+    return pieces
+
+
+def minify_js(text):
+    """Conservatively shrink a script: drop comments, indentation and blank lines.
+
+    Line breaks are kept so automatic semicolon insertion behaves as before,
+    and strings, template literals and regexes are copied verbatim.
+    """
+    out, code = [], []
+
+    def flush():
+        out.append(re.sub(r'[ \t]*\n\s*', '\n', ''.join(code)))
+        code.clear()
+
+    for kind, piece in _split_js(text):
+        if kind == 'code':
+            code.append(piece)
+        elif kind == 'comment':
+            # A comment spanning lines still ends the statement for ASI
+            code.append('\n' if '\n' in piece else ' ' if piece.startswith('/*') else '')
+        else:
+            flush()
+            out.append(piece)
+    flush()
+    return ''.join(out).strip()
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+class Assets:
+    """Fingerprinted, precompressed static assets served with immutable caching.
+
+    ``flask assets build`` writes minified copies named by content hash into
+    ``static/dist`` together with .gz/.br variants and a manifest;
+    ``asset_url()`` in templates resolves through that manifest and falls
+    back to the plain static file when no build exists.
+    """
+
+    def __init__(self, app=None):
+        self.manifest = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.dist_folder = os.path.join(app.static_folder, 'dist')
+        self.manifest_path = os.path.join(self.dist_folder, 'manifest.json')
+        self.sources = app.config['ASSET_SOURCES']
+        if app.config['USE_ASSET_MANIFEST'] and os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+
+        app.add_url_rule('/assets/<path:filename>', 'asset', self.serve)
+        app.add_template_global(self.url, 'asset_url')
+        app.after_request(cache_uploads)
+        app.cli.add_command(assets_cli)
+        app.extensions['assets'] = self
+
+    def url(self, filename):
+        """URL for a static file, fingerprinted when the pipeline has built it."""
+        built = self.manifest.get(filename)
+        if built:
+            return url_for('asset', filename=built)
+        return url_for('static', filename=filename)
+
+    def serve(self, filename):
+        """Serve a built asset, preferring a precompressed variant."""
+        path = safe_join(self.dist_folder, filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        accepted = request.accept_encodings
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if accepted[encoding] and os.path.isfile(path + suffix):
+                response = send_file(path + suffix, mimetype=mimetype, max_age=ONE_YEAR)
+                response.headers['Content-Encoding'] = encoding
+                break
+        else:
+            response = send_file(path, mimetype=mimetype, max_age=ONE_YEAR)
+        response.vary.add('Accept-Encoding')
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    def build(self, static_folder):
+        """Minify, fingerprint and precompress every source; return size stats."""
+        shutil.rmtree(self.dist_folder, ignore_errors=True)
+        manifest, stats = {}, []
+        for source in self.sources:
+            with open(os.path.join(static_folder, source), 'rb') as f:
+                original = f.read()
+            root, ext = os.path.splitext(source)
+            minify = MINIFIERS.get(ext)
+            content = minify(original.decode('utf-8')).encode('utf-8') if minify else original
+            digest = hashlib.sha256(content).hexdigest()[:12]
+            built = f'{root}.{digest}{ext}'
+            path = os.path.join(self.dist_folder, built)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(content)
+            gzipped = gzip.compress(content, compresslevel=9, mtime=0)
+            with open(path + '.gz', 'wb') as f:
+                f.write(gzipped)
+            brotlied = None
+            if brotli is not None:
+                brotlied = brotli.compress(content, quality=11)
+                with open(path + '.br', 'wb') as f:
+                    f.write(brotlied)
+            manifest[source] = built
+            stats.append((source, len(original), len(content), len(gzipped),
+                          len(brotlied) if brotlied is not None else None))
+        with open(self.manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        self.manifest = manifest
+        return stats
+
+
+def cache_uploads(response):
+    """Let browsers keep uploaded files; their names are unique per upload."""
+    if request.endpoint == 'static' and request.view_args.get('filename', '').startswith('uploads/') \
+            and response.status_code == 200:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = ONE_YEAR
+        response.cache_control.immutable = True
+    return response
+
+
+@assets_cli.command('build')
+def build_command():
+    """Minify, fingerprint and precompress static assets into static/dist."""
+    stats = current_app.extensions['assets'].build(current_app.static_folder)
+    click.echo(f'{"asset":<20}{"original":>10}{"minified":>10}{"gzip":>10}{"brotli":>10}')
+    totals = [0, 0, 0, 0]
+    for source, original, minified, gzipped, brotlied in stats:
+        click.echo(f'{source:<20}{original:>10}{minified:>10}{gzipped:>10}{brotlied if brotlied is not None else "-":>10}')
+        totals = [t + (v or 0) for t, v in zip(totals, (original, minified, gzipped, brotlied))]
+    click.echo(f'{"total":<20}{totals[0]:>10}{totals[1]:>10}{totals[2]:>10}{totals[3] or "-":>10}')
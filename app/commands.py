@@ -0,0 +1,30 @@
+import click
+from flask.cli import AppGroup
+from app import db
+from app.models import User
+
+data_cli = AppGroup('data', help='One-off data migration commands.')
+
+
+@data_cli.command('link-parents')
+def link_parents_command():
+    """Copy legacy parent_student_id values into the parent_students links.
+
+    Safe to run repeatedly: parents that already have children, or whose
+    student ID matches no student, are left as they are.
+    """
+    parents = User.query.filter(User.role == 'parent',
+                                User.parent_student_id.isnot(None),
+                                ~User.children.any()).all()
+    linked, missing = 0, []
+    for parent in parents:
+        student = User.query.filter_by(student_id=parent.parent_student_id, role='student').first()
+        if student is None:
+            missing.append(parent.username)
+            continue
+        parent.link_student(student)
+        linked += 1
+    db.session.commit()
+    click.echo(f'Linked {linked} parent(s) to their legacy student')
+    if missing:
+        click.echo(f'No student found for: {", ".join(missing)}')
@@ -0,0 +1,43 @@
+import gzip
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_TYPES = {'text/html', 'text/css', 'text/plain', 'application/json', 'application/javascript'}
+MIN_SIZE = 500  # bytes; smaller bodies are not worth the CPU or the header overhead
+
+
+def accepted_encoding():
+    """Best content-coding the client accepts: 'br', 'gzip' or None."""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress_response(response):
+    """Compress a buffered response body in place when the client supports it."""
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = accepted_encoding()
+    body = response.get_data()
+    if encoding is None or len(body) < MIN_SIZE:
+        return response
+
+    if encoding == 'br':
+        body = brotli.compress(body, quality=5)
+    else:
+        body = gzip.compress(body, compresslevel=6)
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,176 @@
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """A single stream listener waiting for events on a set of channels.
+
+    Kept deliberately small: thousands of idle browsers each hold one of
+    these, so it is just a bounded deque and a pre-acquired lock used as a
+    wake-up signal (no per-subscriber thread or queue.Queue).
+    """
+    __slots__ = ('channels', '_pending', '_wakeup', '__weakref__')
+
+    def __init__(self, channels, backlog):
+        self.channels = tuple(channels)
+        self._pending = deque(maxlen=backlog)
+        self._wakeup = threading.Lock()
+        self._wakeup.acquire()
+
+    def push(self, frame):
+        """Queue an encoded event and wake the waiting stream, if any."""
+        self._pending.append(frame)
+        try:
+            self._wakeup.release()
+        except RuntimeError:
+            # Already signalled and not yet consumed
+            pass
+
+    def wait(self, timeout):
+        """Block up to ``timeout`` seconds and return any pending frames."""
+        if not self._pending:
+            self._wakeup.acquire(timeout=timeout)
+        frames = []
+        while self._pending:
+            frames.append(self._pending.popleft())
+        return frames
+
+
+class LocalBackend:
+    """Delivers published events to subscribers in this process only."""
+
+    def __init__(self, deliver):
+        self._deliver = deliver
+
+    def start(self):
+        pass
+
+    def publish(self, channel, frame):
+        self._deliver(channel, frame)
+
+
+class RedisBackend:
+    """Fans events out to every worker process through Redis pub/sub."""
+
+    prefix = 'announcements:'
+
+    def __init__(self, url, deliver):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError('The redis package is required for a Redis ANNOUNCEMENT_BROKER_URL') from exc
+        self._client = redis.Redis.from_url(url)
+        self._deliver = deliver
+
+    def start(self):
+        deliver = self._deliver
+
+        def listen():
+            # Keep listening for the life of the process: on any connection
+            # error log it, back off and subscribe again on a fresh connection.
+            delay = 1
+            while True:
+                pubsub = None
+                try:
+                    pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                    pubsub.psubscribe(f'{self.prefix}*')
+                    delay = 1
+                    for message in pubsub.listen():
+                        channel = message['channel'].decode()[len(self.prefix):]
+                        deliver(channel, message['data'].decode())
+                except Exception:
+                    logger.exception('Announcement broker lost its Redis subscription; retrying in %ss', delay)
+                finally:
+                    if pubsub is not None:
+                        try:
+                            pubsub.close()
+                        except Exception:
+                            pass
+                time.sleep(delay)
+                delay = min(delay * 2, 30)
+
+        threading.Thread(target=listen, name='announcement-broker', daemon=True).start()
+
+    def publish(self, channel, frame):
+        self._client.publish(f'{self.prefix}{channel}', frame)
+
+
+class AnnouncementBroker:
+    """In-process pub/sub fan-out for the announcement stream."""
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._channels = {}
+        self.backend = None
+        self.backlog = 20
+        self._started = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        url = app.config.get('ANNOUNCEMENT_BROKER_URL')
+        self.backlog = app.config.get('ANNOUNCEMENT_STREAM_BACKLOG', self.backlog)
+        if url and url.startswith(('redis://', 'rediss://')):
+            self.backend = RedisBackend(url, self._deliver)
+        elif app.config.get('ANNOUNCEMENT_BROKER_REQUIRED'):
+            # With several workers the local backend only reaches streams held
+            # by the posting worker, so refuse to run without a shared broker.
+            raise RuntimeError('ANNOUNCEMENT_BROKER_URL must be a redis:// URL in this configuration')
+        else:
+            self.backend = LocalBackend(self._deliver)
+        app.extensions['announcement_broker'] = self
+
+    def subscribe(self, channels):
+        """Register a new subscription for the given channel names."""
+        subscription = Subscription(channels, self.backlog)
+        with self._lock:
+            if not self._started:
+                # Only processes that serve streams listen to the backend;
+                # CLI commands and job workers just publish.
+                self.backend.start()
+                self._started = True
+            for channel in subscription.channels:
+                self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a subscription from every channel it listens on."""
+        with self._lock:
+            for channel in subscription.channels:
+                listeners = self._channels.get(channel)
+                if listeners is not None:
+                    listeners.discard(subscription)
+                    if not listeners:
+                        del self._channels[channel]
+
+    def subscriber_count(self):
+        """Number of distinct live subscriptions."""
+        with self._lock:
+            return len({s for listeners in self._channels.values() for s in listeners})
+
+    def publish(self, channels, event, data, event_id=None):
+        """Encode an event once and publish it on each channel."""
+        frame = format_sse(event, data, event_id)
+        for channel in channels:
+            self.backend.publish(channel, frame)
+
+    def _deliver(self, channel, frame):
+        with self._lock:
+            listeners = tuple(self._channels.get(channel, ()))
+        for subscription in listeners:
+            subscription.push(frame)
+
+
+def format_sse(event, data, event_id=None):
+    """Encode a Server-Sent Events frame."""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return '\n'.join(lines) + '\n\n'
@@ -0,0 +1,187 @@
+import heapq
+import threading
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event, inspect, select
+from app import db
+from app.models import Announcement, DepartmentTimeline
+
+
+class TimelineEntry:
+    """Detached copy of the announcement fields a feed renders."""
+    __slots__ = ('id', 'title', 'content', 'announcement_type', 'department_id', 'created_at')
+
+    def __init__(self, announcement):
+        self.id = announcement.id
+        self.title = announcement.title
+        self.content = announcement.content
+        self.announcement_type = announcement.announcement_type
+        self.department_id = announcement.department_id
+        self.created_at = announcement.created_at
+
+
+class DepartmentTimelines:
+    """Per-process cache of each department's newest announcements.
+
+    Entries are tagged with the department's ``DepartmentTimeline.version``;
+    a read costs one primary-key lookup per department and only rebuilds
+    (one indexed query) when another request or worker changed the feed.
+    The session listeners below bump the version whenever an Announcement
+    is written, whichever code path writes it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timelines = {}
+
+    def get(self, department_ids, limit):
+        """Newest ``limit`` entries across the given departments."""
+        if not department_ids:
+            return []
+        versions = dict(db.session.query(DepartmentTimeline.department_id,
+                                         DepartmentTimeline.version)
+                        .filter(DepartmentTimeline.department_id.in_(department_ids)))
+        timelines = []
+        for department_id in department_ids:
+            version = versions.get(department_id, 0)
+            with self._lock:
+                cached = self._timelines.get(department_id)
+            if cached is None or cached[0] != version:
+                cached = (version, self._load(department_id))
+                with self._lock:
+                    self._timelines[department_id] = cached
+            timelines.append(cached[1])
+        if len(timelines) == 1:
+            return list(timelines[0][:limit])
+        merged = heapq.merge(*timelines, key=lambda entry: entry.created_at, reverse=True)
+        return [entry for entry, _ in zip(merged, range(limit))]
+
+    def push(self, entry, version):
+        """Prepend a just-committed announcement if the cache was current."""
+        size = current_app.config['DEPARTMENT_TIMELINE_SIZE']
+        with self._lock:
+            cached = self._timelines.get(entry.department_id)
+            if cached is not None and cached[0] == version - 1:
+                entries = (entry,) + cached[1][:size - 1]
+                self._timelines[entry.department_id] = (version, entries)
+            else:
+                self._timelines.pop(entry.department_id, None)
+
+    def discard(self, department_id):
+        """Drop a department's cached timeline so the next read rebuilds it."""
+        with self._lock:
+            self._timelines.pop(department_id, None)
+
+    def _load(self, department_id):
+        size = current_app.config['DEPARTMENT_TIMELINE_SIZE']
+        announcements = Announcement.query.filter_by(
+            department_id=department_id,
+            is_active=True
+        ).order_by(Announcement.created_at.desc()).limit(size).all()
+        return tuple(TimelineEntry(a) for a in announcements)
+
+
+timelines = DepartmentTimelines()
+
+
+def feed_department_ids(user):
+    """Departments whose announcements a user should see.
+
+    Parents follow the departments of all their linked students.
+    """
+    if user.role == 'parent':
+        return sorted({child.department_id for child in user.children if child.department_id})
+    return [user.department_id] if user.department_id else []
+
+
+def department_feed(user, limit=10):
+    """Recent announcements for a user's departments, newest first."""
+    return timelines.get(feed_department_ids(user), limit)
+
+
+def bump_timeline(connection, department_id):
+    """Advance a department's feed version on ``connection``'s transaction.
+
+    Returns the new version. A single INSERT ... ON CONFLICT DO UPDATE, so
+    two workers posting the first announcement of a department cannot both
+    try to create the row.
+    """
+    dialect = connection.dialect.name
+    table = DepartmentTimeline.__table__
+    if dialect == 'mysql':
+        # MySQL has no RETURNING; the upsert holds the row lock for the SELECT
+        from sqlalchemy.dialects.mysql import insert
+        statement = insert(table).values(department_id=department_id, version=1,
+                                         updated_at=datetime.utcnow())
+        connection.execute(statement.on_duplicate_key_update(
+            version=table.c.version + 1, updated_at=statement.inserted.updated_at))
+        return connection.execute(select(table.c.version).where(
+            table.c.department_id == department_id)).scalar_one()
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise RuntimeError(f'bump_timeline does not support the {dialect} database')
+    statement = insert(table).values(department_id=department_id, version=1,
+                                     updated_at=datetime.utcnow())
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.department_id],
+        set_={'version': table.c.version + 1, 'updated_at': statement.excluded.updated_at}
+    ).returning(table.c.version)
+    return connection.execute(statement).scalar_one()
+
+
+@event.listens_for(db.session, 'before_flush')
+def _collect_timeline_changes(session, flush_context, instances):
+    """Note the departments whose feed this flush changes."""
+    departments = session.info.setdefault('timeline_departments', set())
+    added = session.info.setdefault('timeline_added', [])
+    for announcement in session.new:
+        if isinstance(announcement, Announcement):
+            departments.add(announcement.department_id)
+            added.append(announcement)
+    for announcement in session.dirty:
+        if isinstance(announcement, Announcement) and session.is_modified(announcement):
+            departments.add(announcement.department_id)
+            # Moved between departments: the old feed changes too
+            departments.update(inspect(announcement).attrs.department_id.history.deleted)
+    for announcement in session.deleted:
+        if isinstance(announcement, Announcement):
+            departments.add(announcement.department_id)
+
+
+@event.listens_for(db.session, 'after_flush')
+def _bump_timelines(session, flush_context):
+    """Bump each changed department's version in the flushing transaction."""
+    departments = session.info.pop('timeline_departments', set())
+    versions = session.info.setdefault('timeline_versions', {})
+    for department_id in departments - {None}:
+        versions[department_id] = bump_timeline(session.connection(), department_id)
+    # Snapshot new announcements now; after_commit may not emit SQL to load them
+    entries = session.info.setdefault('timeline_entries', [])
+    entries.extend(TimelineEntry(a) for a in session.info.pop('timeline_added', [])
+                   if a.is_active is not False)
+
+
+@event.listens_for(db.session, 'after_commit')
+def _refresh_timelines(session):
+    """Prepend committed announcements to this process's cache, or drop stale entries."""
+    versions = session.info.pop('timeline_versions', {})
+    entries = {}
+    for entry in session.info.pop('timeline_entries', []):
+        entries.setdefault(entry.department_id, []).append(entry)
+    for department_id, version in versions.items():
+        added = entries.get(department_id, [])
+        if len(added) == 1:
+            # push() checks the cache was exactly one version behind
+            timelines.push(added[0], version)
+        else:
+            timelines.discard(department_id)
+
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def _forget_timeline_changes(session, previous_transaction):
+    """Drop changes noted for a transaction that was rolled back."""
+    for key in ('timeline_departments', 'timeline_added', 'timeline_versions', 'timeline_entries'):
+        session.info.pop(key, None)
@@ -53,3 +53,10 @@ class AnnouncementForm(FlaskForm):
         FileAllowed(['pdf', 'doc', 'docx', 'txt', 'jpg', 'jpeg', 'png'], 'Invalid file type!')
     ])
     submit = SubmitField('Post')
+
+class ParentLinkForm(FlaskForm):
+    """Admin form for linking a student to, or unlinking one from, a parent account."""
+    parent_id = SelectField('Parent', coerce=int, validators=[DataRequired()])
+    student_id = StringField('Student ID', validators=[DataRequired(), Length(max=20)])
+    link = SubmitField('Link')
+    unlink = SubmitField('Unlink')
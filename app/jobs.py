@@ -0,0 +1,169 @@
+import json
+import os
+import socket
+import time
+import traceback
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app import db
+from app.models import Job
+
+_registry = {}
+
+jobs_cli = AppGroup('jobs', help='Background job commands.')
+
+
+def job(name):
+    """Register a function as a background job handler.
+
+    The handler is called as ``handler(job, **payload)`` inside an app
+    context and should call ``report_progress(job, ...)`` at least every
+    JOB_TIMEOUT seconds, which doubles as the worker's heartbeat; its
+    return value is stored as the job result.
+    """
+    def decorator(f):
+        _registry[name] = f
+        return f
+    return decorator
+
+
+def enqueue(name, payload=None, priority=0, owner=None, max_attempts=None):
+    """Queue a job and return it; the caller's request returns immediately."""
+    if name not in _registry:
+        raise KeyError(f'Unknown job: {name}')
+    queued = Job(
+        name=name,
+        payload=json.dumps(payload or {}),
+        priority=priority,
+        owner_id=owner.id if owner is not None else None,
+        max_attempts=max_attempts or current_app.config['JOB_MAX_ATTEMPTS']
+    )
+    db.session.add(queued)
+    db.session.commit()
+    return queued
+
+
+def report_progress(job, progress, message=None):
+    """Record progress (0-100) so the UI can poll it, and refresh the heartbeat."""
+    job.progress = max(0, min(100, int(progress)))
+    if message is not None:
+        job.message = message[:256]
+    job.heartbeat_at = datetime.utcnow()
+    db.session.commit()
+
+
+def claim_next(worker_id):
+    """Atomically take the highest-priority due job, or return None.
+
+    Postgres skips rows other workers have locked; on SQLite the guarded
+    UPDATE alone decides which worker wins.
+    """
+    now = datetime.utcnow()
+    job_id = db.session.query(Job.id).filter(
+        Job.status == 'queued',
+        Job.run_at <= now
+    ).order_by(Job.priority.desc(), Job.run_at, Job.id).limit(1).with_for_update(skip_locked=True).scalar()
+    if job_id is None:
+        db.session.rollback()
+        return None
+    claimed = Job.query.filter_by(id=job_id, status='queued').update({
+        Job.status: 'running',
+        Job.locked_by: worker_id,
+        Job.started_at: now,
+        Job.heartbeat_at: now,
+        Job.attempts: Job.attempts + 1
+    }, synchronize_session=False)
+    db.session.commit()
+    return db.session.get(Job, job_id) if claimed else None
+
+
+def run_job(job):
+    """Execute a claimed job, recording its result or scheduling a retry."""
+    try:
+        handler = _registry[job.name]
+        result = handler(job, **json.loads(job.payload))
+    except Exception:
+        current_app.logger.exception('Job %s (%s) failed on attempt %s', job.id, job.name, job.attempts)
+        db.session.rollback()
+        job.error = traceback.format_exc()
+        job.locked_by = None
+        if job.attempts < job.max_attempts:
+            # Exponential backoff: 10s, 20s, 40s, ...
+            delay = current_app.config['JOB_RETRY_DELAY'] * 2 ** (job.attempts - 1)
+            job.status = 'queued'
+            job.run_at = datetime.utcnow() + timedelta(seconds=delay)
+            job.message = f'Retrying in {delay}s (attempt {job.attempts} of {job.max_attempts})'
+        else:
+            job.status = 'failed'
+            job.finished_at = datetime.utcnow()
+            job.message = f'Failed after {job.attempts} attempts'
+        db.session.commit()
+        return False
+    job.status = 'succeeded'
+    job.progress = 100
+    job.result = json.dumps(result) if result is not None else None
+    job.locked_by = None
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+    return True
+
+
+def requeue_stale(timeout):
+    """Recover running jobs whose heartbeat is older than ``timeout`` seconds.
+
+    Their worker is presumed dead: jobs with attempts left go back to the
+    queue, the rest are marked failed. Returns (requeued, failed).
+    """
+    now = datetime.utcnow()
+    stale = Job.query.filter(Job.status == 'running', Job.heartbeat_at < now - timedelta(seconds=timeout))
+    failed = stale.filter(Job.attempts >= Job.max_attempts).update({
+        Job.status: 'failed',
+        Job.locked_by: None,
+        Job.finished_at: now,
+        Job.message: 'Failed: the worker stopped responding'
+    }, synchronize_session=False)
+    requeued = stale.filter(Job.attempts < Job.max_attempts).update({
+        Job.status: 'queued',
+        Job.locked_by: None,
+        Job.run_at: now
+    }, synchronize_session=False)
+    db.session.commit()
+    return requeued, failed
+
+
+def work(worker_id=None, poll_interval=None, burst=False):
+    """Process jobs until interrupted (or until the queue is empty with ``burst``)."""
+    worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+    poll_interval = poll_interval or current_app.config['JOB_POLL_INTERVAL']
+    timeout = current_app.config['JOB_TIMEOUT']
+    last_sweep = None
+    while True:
+        # Sweep on start-up too: the previous worker may have died mid-job
+        if last_sweep is None or time.monotonic() - last_sweep > timeout:
+            requeued, failed = requeue_stale(timeout)
+            if requeued or failed:
+                current_app.logger.warning('Recovered stale jobs: %s requeued, %s failed', requeued, failed)
+            last_sweep = time.monotonic()
+        claimed = claim_next(worker_id)
+        if claimed is None:
+            if burst:
+                return
+            time.sleep(poll_interval)
+            continue
+        current_app.logger.info('Running job %s (%s)', claimed.id, claimed.name)
+        run_job(claimed)
+        db.session.remove()
+
+
+@jobs_cli.command('work')
+@click.option('--burst', is_flag=True, help='Exit once the queue is empty.')
+@click.option('--poll-interval', type=float, default=None, help='Seconds to sleep when idle.')
+def work_command(burst, poll_interval):
+    """Start a worker process that runs queued jobs."""
+    click.echo(f'Job worker {os.getpid()} started ({", ".join(sorted(_registry))})')
+    try:
+        work(poll_interval=poll_interval, burst=burst)
+    except KeyboardInterrupt:
+        click.echo('Job worker stopped')
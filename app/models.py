@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -8,6 +9,15 @@ def load_user(user_id):
     """Load user by ID for Flask-Login."""
     return User.query.get(int(user_id))
 
+# Parent-to-student links; the composite primary key indexes lookups by parent,
+# the secondary index lookups by student
+parent_students = db.Table(
+    'parent_students',
+    db.Column('parent_id', db.Integer, db.ForeignKey('users.id'), primary_key=True),
+    db.Column('student_id', db.Integer, db.ForeignKey('users.id'), primary_key=True),
+    db.Index('ix_parent_students_student_id', 'student_id')
+)
+
 class User(UserMixin, db.Model):
     """User model for authentication and role management."""
     __tablename__ = 'users'
@@ -19,13 +29,19 @@ class User(UserMixin, db.Model):
     full_name = db.Column(db.String(128), nullable=False)
     role = db.Column(db.String(20), nullable=False)  # student, parent, teacher, admin
     student_id = db.Column(db.String(20), unique=True, nullable=True)  # For students
-    parent_student_id = db.Column(db.String(20), nullable=True)  # For parents (linked student ID)
+    parent_student_id = db.Column(db.String(20), nullable=True)  # Legacy single-child link, see children
     department_id = db.Column(db.Integer, db.ForeignKey('departments.id'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
     
     # Relationships
     department = db.relationship('Department', backref='users', lazy=True)
+    children = db.relationship('User', secondary=parent_students,
+                               primaryjoin=lambda: User.id == parent_students.c.parent_id,
+                               secondaryjoin=lambda: User.id == parent_students.c.student_id,
+                               backref=db.backref('parents', lazy=True),
+                               order_by=lambda: User.full_name,
+                               lazy=True)
     
     def set_password(self, password):
         """Hash and set password."""
@@ -35,6 +51,16 @@ class User(UserMixin, db.Model):
         """Check if password matches hash."""
         return check_password_hash(self.password_hash, password)
     
+    def link_student(self, student):
+        """Link a student to this parent account."""
+        if student not in self.children:
+            self.children.append(student)
+    
+    def unlink_student(self, student):
+        """Remove a student from this parent account."""
+        if student in self.children:
+            self.children.remove(student)
+    
     def __repr__(self):
         return f'<User {self.username} ({self.role})>'
 
@@ -57,6 +83,10 @@ class Department(db.Model):
 class Announcement(db.Model):
     """Announcement model for departments to post updates."""
     __tablename__ = 'announcements'
+    __table_args__ = (
+        # Serves per-department feeds newest-first without scanning other departments
+        db.Index('ix_announcements_department_feed', 'department_id', 'is_active', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -76,3 +106,64 @@ class Announcement(db.Model):
     
     def __repr__(self):
         return f'<Announcement {self.title} ({self.announcement_type})>'
+
+class DepartmentTimeline(db.Model):
+    """Version counter for a department's announcement feed.
+
+    Bumped in the same transaction as every announcement write (by the
+    session listeners in app/feeds.py) so each worker can tell whether its
+    cached timeline is still current.
+    """
+    __tablename__ = 'department_timelines'
+    
+    department_id = db.Column(db.Integer, db.ForeignKey('departments.id'), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<DepartmentTimeline {self.department_id} v{self.version}>'
+
+class Job(db.Model):
+    """Background job; the table doubles as the queue the workers poll."""
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        db.Index('ix_jobs_queue', 'status', 'priority', 'run_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(64), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default='{}')  # JSON arguments
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, succeeded, failed
+    priority = db.Column(db.Integer, nullable=False, default=0)  # Higher runs first
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    progress = db.Column(db.Integer, nullable=False, default=0)  # 0-100
+    message = db.Column(db.String(256), nullable=True)
+    result = db.Column(db.Text, nullable=True)  # JSON result
+    error = db.Column(db.Text, nullable=True)
+    owner_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    locked_by = db.Column(db.String(64), nullable=True)  # Worker currently running the job
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)  # Last sign of life from the running worker
+    finished_at = db.Column(db.DateTime, nullable=True)
+    
+    # Relationships
+    owner = db.relationship('User', backref='jobs', lazy=True)
+    
+    def to_dict(self, include_error=False):
+        """Status payload polled by the UI; the traceback is for admins only."""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'status': self.status,
+            'progress': self.progress,
+            'message': self.message,
+            'attempts': self.attempts,
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error if include_error and self.status == 'failed' else None
+        }
+    
+    def __repr__(self):
+        return f'<Job {self.id} {self.name} ({self.status})>'
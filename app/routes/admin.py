@@ -2,6 +2,7 @@ from flask import Blueprint, render_template, flash, redirect, url_for
 from flask_login import login_required, current_user
 from functools import wraps
 from app.models import User, Department, Announcement
+from app.forms import ParentLinkForm
 from app import db
 
 admin_bp = Blueprint('admin', __name__)
@@ -34,10 +35,16 @@ def dashboard():
     # Get recent users
     recent_users = User.query.order_by(User.created_at.desc()).limit(5).all()
     
+    # Parents with linked children, for the parent link panel
+    linked_parents = User.query.filter(User.role == 'parent', User.children.any()) \
+        .order_by(User.full_name).all()
+    
     return render_template('admin/dashboard.html',
                          title='Admin Dashboard',
                          stats=stats,
-                         recent_users=recent_users)
+                         recent_users=recent_users,
+                         link_form=parent_link_form(),
+                         linked_parents=linked_parents)
 
 @admin_bp.route('/users')
 @login_required
@@ -49,6 +56,37 @@ def users():
                          title='Manage Users',
                          users=all_users)
 
+@admin_bp.route('/parent-links', methods=['POST'])
+@login_required
+@admin_required
+def parent_links():
+    """Link a student to, or unlink one from, a parent account (parents may have several children)."""
+    form = parent_link_form()
+    if not form.validate_on_submit():
+        flash('Choose a parent and enter a Student ID.', 'danger')
+        return redirect(url_for('admin.dashboard'))
+    
+    parent = User.query.filter_by(id=form.parent_id.data, role='parent').first_or_404()
+    student = User.query.filter_by(student_id=form.student_id.data.strip(), role='student').first()
+    if not student:
+        flash('No student found with that Student ID.', 'danger')
+    elif form.unlink.data:
+        parent.unlink_student(student)
+        db.session.commit()
+        flash(f'{student.full_name} unlinked from {parent.full_name}.', 'success')
+    else:
+        parent.link_student(student)
+        db.session.commit()
+        flash(f'{student.full_name} linked to {parent.full_name}.', 'success')
+    return redirect(url_for('admin.dashboard'))
+
+def parent_link_form():
+    """Parent link form with the active parent accounts as choices."""
+    form = ParentLinkForm()
+    parents = User.query.filter_by(role='parent', is_active=True).order_by(User.full_name).all()
+    form.parent_id.choices = [(p.id, f'{p.full_name} ({p.username})') for p in parents]
+    return form
+
 @admin_bp.route('/departments')
 @login_required
 @admin_required
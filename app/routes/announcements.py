@@ -1,10 +1,13 @@
-from flask import Blueprint, render_template, flash, redirect, url_for, request, current_app
+from flask import Blueprint, render_template, flash, redirect, url_for, request, current_app, Response
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
-from app import db
+from app import db, broker
+from app.events import format_sse
+from app.feeds import feed_department_ids
 from app.models import Announcement
 from app.forms import AnnouncementForm
 import os
+import time
 
 announcements_bp = Blueprint('announcements', __name__)
 
@@ -58,6 +61,9 @@ def create():
         db.session.add(announcement)
         db.session.commit()
         
+        broker.publish(announcement_channels(announcement), 'announcement',
+                       announcement_event(announcement), event_id=announcement.id)
+        
         flash(f'{form.announcement_type.data.capitalize()} created successfully!', 'success')
         return redirect(url_for('announcements.view', announcement_id=announcement.id))
     
@@ -82,6 +88,10 @@ def list_all():
     
     query = Announcement.query.filter_by(is_active=True)
     
+    # Students and parents only see their own department's posts
+    if current_user.role in ['student', 'parent']:
+        query = query.filter(Announcement.department_id.in_(feed_department_ids(current_user)))
+    
     if announcement_type != 'all':
         query = query.filter_by(announcement_type=announcement_type)
     
@@ -106,5 +116,67 @@ def delete(announcement_id):
     announcement.is_active = False
     db.session.commit()
     
+    broker.publish(announcement_channels(announcement), 'deleted', {'id': announcement.id})
+    
     flash('Announcement deleted successfully.', 'success')
     return redirect(url_for('announcements.list_all'))
+
+@announcements_bp.route('/stream')
+@login_required
+def stream():
+    """Server-Sent Events stream pushing new announcements as they are posted."""
+    channels = stream_channels(current_user)
+    keepalive = current_app.config['ANNOUNCEMENT_STREAM_KEEPALIVE']
+    timeout = current_app.config['ANNOUNCEMENT_STREAM_TIMEOUT']
+    
+    # Subscribe before replaying so nothing posted in between is lost;
+    # the client ignores ids it has already rendered.
+    subscription = broker.subscribe(channels)
+    missed = []
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    if last_event_id is not None:
+        query = Announcement.query.filter(Announcement.is_active == True,
+                                          Announcement.id > last_event_id)
+        if channels != ['all']:
+            query = query.filter(Announcement.department_id.in_(feed_department_ids(current_user)))
+        missed = [format_sse('announcement', announcement_event(a), a.id)
+                  for a in query.order_by(Announcement.id).limit(broker.backlog).all()]
+    
+    def generate():
+        try:
+            yield 'retry: 5000\n\n'
+            for frame in missed:
+                yield frame
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                frames = subscription.wait(keepalive)
+                if not frames:
+                    yield ': keep-alive\n\n'
+                for frame in frames:
+                    yield frame
+        finally:
+            broker.unsubscribe(subscription)
+    
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def stream_channels(user):
+    """Channels a user listens on: admins follow all posts, everyone else their feed departments."""
+    if user.role == 'admin':
+        return ['all']
+    return [f'department:{department_id}' for department_id in feed_department_ids(user)]
+
+def announcement_channels(announcement):
+    """Channels an announcement is published on."""
+    return [f'department:{announcement.department_id}', 'all']
+
+def announcement_event(announcement):
+    """Compact payload rendered by the dashboard stream client."""
+    return {
+        'id': announcement.id,
+        'title': announcement.title,
+        'excerpt': announcement.content[:100],
+        'type': announcement.announcement_type,
+        'date': announcement.created_at.strftime('%b %d, %Y'),
+        'url': url_for('announcements.view', announcement_id=announcement.id)
+    }
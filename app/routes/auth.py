@@ -55,6 +55,11 @@ def register():
         )
         user.set_password(form.password.data)
         
+        if user.role == 'parent' and user.parent_student_id:
+            student = User.query.filter_by(student_id=user.parent_student_id, role='student').first()
+            if student:
+                user.link_student(student)
+        
         db.session.add(user)
         db.session.commit()
         
@@ -0,0 +1,15 @@
+from flask import Blueprint, jsonify, abort
+from flask_login import login_required, current_user
+from app import db
+from app.models import Job
+
+jobs_bp = Blueprint('jobs', __name__)
+
+@jobs_bp.route('/<int:job_id>')
+@login_required
+def status(job_id):
+    """Job status and progress, polled by the UI."""
+    job = db.get_or_404(Job, job_id)
+    if job.owner_id != current_user.id and current_user.role != 'admin':
+        abort(403)
+    return jsonify(job.to_dict(include_error=current_user.role == 'admin'))
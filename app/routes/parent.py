@@ -1,8 +1,10 @@
-from flask import Blueprint, render_template, flash
+from flask import Blueprint, render_template, flash, request
 from flask_login import login_required, current_user
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from app.models import Announcement
+from app.feeds import department_feed, feed_department_ids
 from flask import current_app
 
 parent_bp = Blueprint('parent', __name__)
@@ -21,66 +23,83 @@ def parent_required(f):
 @login_required
 @parent_required
 def dashboard():
-    """Parent dashboard showing child's attendance and announcements."""
-    if not current_user.parent_student_id:
+    """Parent dashboard showing every linked child's attendance and announcements."""
+    children = current_user.children
+    if not children:
         flash('No student linked to your account. Please contact admin.', 'warning')
         return render_template('parent/dashboard.html', 
                              title='Parent Dashboard',
-                             attendance=None,
+                             children=[],
+                             attendance={},
                              announcements=[])
     
-    # Fetch child's attendance data
-    attendance_data = fetch_attendance_data(current_user.parent_student_id)
+    # Fetch every child's attendance in one concurrent round
+    attendance_data = fetch_attendance_batch([child.student_id for child in children])
     
-    # Get recent announcements
-    announcements = Announcement.query.filter_by(is_active=True).order_by(
-        Announcement.created_at.desc()
-    ).limit(10).all()
+    # Get recent announcements for the children's departments
+    announcements = department_feed(current_user, limit=10)
     
     return render_template('parent/dashboard.html',
                          title='Parent Dashboard',
+                         children=children,
                          attendance=attendance_data,
-                         announcements=announcements,
-                         student_id=current_user.parent_student_id)
+                         announcements=announcements)
 
 @parent_bp.route('/attendance')
 @login_required
 @parent_required
 def attendance():
-    """Detailed view of child's attendance."""
-    if not current_user.parent_student_id:
+    """Detailed view of one child's attendance (?student=<student_id>)."""
+    children = current_user.children
+    if not children:
         flash('No student linked to your account.', 'warning')
         return render_template('parent/attendance.html',
                              title='Student Attendance',
+                             children=[],
                              attendance=None,
                              logs=[])
     
-    attendance_data = fetch_attendance_data(current_user.parent_student_id)
-    attendance_logs = fetch_attendance_logs(current_user.parent_student_id)
+    requested = request.args.get('student')
+    child = next((c for c in children if c.student_id == requested), children[0])
+    
+    attendance_data = fetch_attendance_data(child.student_id)
+    attendance_logs = fetch_attendance_logs(child.student_id)
     
     return render_template('parent/attendance.html',
                          title='Student Attendance',
+                         children=children,
+                         child=child,
                          attendance=attendance_data,
                          logs=attendance_logs,
-                         student_id=current_user.parent_student_id)
+                         student_id=child.student_id)
 
 @parent_bp.route('/announcements')
 @login_required
 @parent_required
 def announcements():
-    """View all announcements."""
-    all_announcements = Announcement.query.filter_by(is_active=True).order_by(
-        Announcement.created_at.desc()
-    ).all()
+    """View all announcements for the child's department."""
+    all_announcements = Announcement.query.filter(
+        Announcement.department_id.in_(feed_department_ids(current_user)),
+        Announcement.is_active == True
+    ).order_by(Announcement.created_at.desc()).all()
     
     return render_template('parent/announcements.html',
                          title='Announcements',
                          announcements=all_announcements)
 
-def fetch_attendance_data(student_id):
+def fetch_attendance_batch(student_ids):
+    """Fetch attendance summaries for several students concurrently, keyed by student ID."""
+    if not student_ids:
+        return {}
+    api_url = current_app.config['BACKEND_API_URL']
+    with ThreadPoolExecutor(max_workers=min(len(student_ids), 8)) as pool:
+        results = pool.map(lambda student_id: fetch_attendance_data(student_id, api_url), student_ids)
+        return dict(zip(student_ids, results))
+
+def fetch_attendance_data(student_id, api_url=None):
     """Fetch attendance percentage from backend API."""
     try:
-        api_url = current_app.config['BACKEND_API_URL']
+        api_url = api_url or current_app.config['BACKEND_API_URL']
         response = requests.get(f'{api_url}/attendance/{student_id}', timeout=5)
         if response.status_code == 200:
             return response.json()
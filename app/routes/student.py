@@ -1,8 +1,11 @@
-from flask import Blueprint, render_template, flash
+from flask import Blueprint, render_template, flash, request
 from flask_login import login_required, current_user
 from functools import wraps
+from datetime import date
+import json
 import requests
 from app.models import Announcement
+from app.feeds import department_feed, feed_department_ids
 from flask import current_app
 
 student_bp = Blueprint('student', __name__)
@@ -25,10 +28,8 @@ def dashboard():
     # Fetch attendance data from backend API
     attendance_data = fetch_attendance_data(current_user.student_id)
     
-    # Get recent announcements
-    announcements = Announcement.query.filter_by(is_active=True).order_by(
-        Announcement.created_at.desc()
-    ).limit(10).all()
+    # Get recent announcements for the student's department
+    announcements = department_feed(current_user, limit=10)
     
     return render_template('student/dashboard.html', 
                          title='Student Dashboard',
@@ -39,23 +40,53 @@ def dashboard():
 @login_required
 @student_required
 def attendance():
-    """Detailed attendance view."""
+    """Detailed attendance view; logs are loaded page by page from attendance_logs."""
     attendance_data = fetch_attendance_data(current_user.student_id)
-    attendance_logs = fetch_attendance_logs(current_user.student_id)
     
     return render_template('student/attendance.html',
                          title='My Attendance',
                          attendance=attendance_data,
-                         logs=attendance_logs)
+                         logs_per_page=LOGS_PER_PAGE)
+
+@student_bp.route('/attendance/logs')
+@login_required
+@student_required
+def attendance_logs():
+    """One page of attendance logs as compact JSON (field list + row arrays).
+    
+    Query parameters: page, per_page (max 100), start and end (YYYY-MM-DD).
+    ``total`` counts the rows known so far; while ``has_more`` is true there
+    may be more beyond it.
+    """
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', LOGS_PER_PAGE, type=int), 1), 100)
+    start = parse_date(request.args.get('start'))
+    end = parse_date(request.args.get('end'))
+    
+    logs, total, has_more = fetch_attendance_logs_page(current_user.student_id, page, per_page, start, end)
+    payload = {
+        'total': total,
+        'has_more': has_more,
+        'page': page,
+        'per_page': per_page,
+        'fields': LOG_FIELDS,
+        'rows': [[log.get(field) for field in LOG_FIELDS] for log in logs]
+    }
+    response = current_app.response_class(json.dumps(payload, separators=(',', ':')),
+                                          mimetype='application/json')
+    response.cache_control.private = True
+    response.cache_control.max_age = 60
+    return response
 
 @student_bp.route('/announcements')
 @login_required
 @student_required
 def announcements():
-    """View all announcements."""
-    all_announcements = Announcement.query.filter_by(is_active=True).order_by(
-        Announcement.created_at.desc()
-    ).all()
+    """View all announcements for the student's department."""
+    all_announcements = Announcement.query.filter(
+        Announcement.department_id.in_(feed_department_ids(current_user)),
+        Announcement.is_active == True
+    ).order_by(Announcement.created_at.desc()).all()
     
     return render_template('student/announcements.html',
                          title='Announcements',
@@ -74,15 +105,54 @@ def fetch_attendance_data(student_id):
         print(f"Error fetching attendance data: {e}")
         return {'percentage': 0, 'total_days': 0, 'present_days': 0, 'absent_days': 0}
 
-def fetch_attendance_logs(student_id):
-    """Fetch detailed attendance logs from backend API."""
+LOG_FIELDS = ['date', 'day', 'status', 'time_in', 'time_out', 'remarks']
+LOGS_PER_PAGE = 100
+
+def parse_date(value):
+    """Parse a YYYY-MM-DD query value, ignoring anything malformed."""
+    try:
+        return date.fromisoformat(value).isoformat() if value else None
+    except ValueError:
+        return None
+
+def fetch_attendance_logs_page(student_id, page, per_page, start_date=None, end_date=None):
+    """Fetch one page of attendance logs from backend API.
+    
+    Returns (logs, total, has_more). The logs endpoint only takes a date
+    window and a ``limit`` (first N rows), so ask for everything up to the
+    end of this page and slice it here. When the backend returns all
+    ``limit`` rows the real total is unknown: ``total`` is the rows seen so
+    far and ``has_more`` is true. A response with a ``pagination`` block for
+    exactly this page is used as-is.
+    """
+    offset = (page - 1) * per_page
+    limit = offset + per_page
+    params = {'limit': limit, 'page': page, 'per_page': per_page}
+    if start_date:
+        params['start_date'] = start_date
+    if end_date:
+        params['end_date'] = end_date
     try:
         api_url = current_app.config['BACKEND_API_URL']
-        response = requests.get(f'{api_url}/attendance/{student_id}/logs', timeout=5)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return []
+        response = requests.get(f'{api_url}/attendance/{student_id}/logs', params=params, timeout=5)
+        if response.status_code != 200:
+            return [], 0, False
+        data = response.json()
     except Exception as e:
         print(f"Error fetching attendance logs: {e}")
-        return []
+        return [], 0, False
+    
+    if isinstance(data, list):
+        logs, reported = data, None
+    else:
+        logs = data.get('logs', data.get('data', []))
+        pagination = data.get('pagination') or {}
+        if pagination.get('page') == page and pagination.get('per_page') == per_page:
+            return logs[:per_page], pagination.get('total_items', offset + len(logs)), False
+        reported = data.get('total_records')
+    
+    rows = logs[offset:limit]
+    if reported is not None and reported > len(logs):
+        # The backend counted past the limit, so this is the real total
+        return rows, reported, False
+    return rows, len(logs), len(logs) >= limit
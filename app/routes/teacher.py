@@ -1,8 +1,9 @@
-from flask import Blueprint, render_template, flash, redirect, url_for
+from flask import Blueprint, render_template, flash, redirect, url_for, jsonify
 from flask_login import login_required, current_user
 from functools import wraps
 import requests
 from app.models import Announcement, User
+from app.jobs import enqueue
 from flask import current_app
 
 teacher_bp = Blueprint('teacher', __name__)
@@ -69,3 +70,16 @@ def attendance():
     # This would integrate with the backend API to mark attendance
     return render_template('teacher/attendance.html',
                          title='Manage Attendance')
+
+@teacher_bp.route('/reports/attendance', methods=['POST'])
+@login_required
+@teacher_required
+def attendance_report():
+    """Queue a department attendance report and return its job for polling."""
+    if not current_user.department:
+        return jsonify({'error': 'You are not assigned to any department.'}), 400
+    
+    job = enqueue('reports.department_attendance',
+                  {'department_id': current_user.department_id},
+                  owner=current_user)
+    return jsonify({'id': job.id, 'status_url': url_for('jobs.status', job_id=job.id)}), 202
@@ -31,6 +31,25 @@ document.addEventListener('DOMContentLoaded', function() {
     popoverTriggerList.map(function (popoverTriggerEl) {
         return new bootstrap.Popover(popoverTriggerEl);
     });
+
+    // Live announcement feed
+    const streamContainer = document.querySelector('[data-announcement-stream]');
+    if (streamContainer) {
+        subscribeAnnouncements(streamContainer);
+    }
+
+    // Paginated, virtually scrolled attendance logs
+    const logContainer = document.querySelector('[data-attendance-logs]');
+    if (logContainer) {
+        new AttendanceLogTable(logContainer).load();
+    }
+
+    // Buttons that start a background job and show its progress
+    document.querySelectorAll('[data-job-start]').forEach(button => {
+        button.addEventListener('click', function() {
+            startJob(button, document.querySelector(button.dataset.jobProgress));
+        });
+    });
 });
 
 // Format dates
@@ -106,3 +125,321 @@ function hideLoading() {
         spinner.remove();
     }
 }
+
+// Real-time announcements (Server-Sent Events)
+const ANNOUNCEMENT_ICONS = {
+    assignment: 'bi-file-earmark-text text-primary',
+    notice: 'bi-exclamation-circle text-warning',
+    announcement: 'bi-megaphone text-info'
+};
+
+function subscribeAnnouncements(container, maxItems = 5) {
+    if (!window.EventSource) {
+        return null;
+    }
+    const source = new EventSource(container.dataset.announcementStream);
+
+    source.addEventListener('announcement', function(e) {
+        const data = JSON.parse(e.data);
+        if (container.querySelector(`[data-announcement-id="${data.id}"]`)) {
+            return;
+        }
+        let list = container.querySelector('.list-group');
+        if (!list) {
+            container.innerHTML = '';
+            list = document.createElement('div');
+            list.className = 'list-group list-group-flush';
+            container.appendChild(list);
+        }
+        list.prepend(renderAnnouncementItem(data));
+        while (list.children.length > maxItems) {
+            list.lastElementChild.remove();
+        }
+    });
+
+    source.addEventListener('deleted', function(e) {
+        const data = JSON.parse(e.data);
+        const item = container.querySelector(`[data-announcement-id="${data.id}"]`);
+        if (item) {
+            item.remove();
+        }
+    });
+
+    return source;
+}
+
+function renderAnnouncementItem(data) {
+    const item = document.createElement('a');
+    item.href = data.url;
+    item.className = 'list-group-item list-group-item-action';
+    item.dataset.announcementId = data.id;
+    item.innerHTML = `
+        <div class="d-flex w-100 justify-content-between">
+            <h6 class="mb-1"><i class="bi"></i> <span></span></h6>
+            <small class="text-muted"></small>
+        </div>
+        <p class="mb-1 text-muted"></p>
+        <small class="badge bg-secondary"></small>`;
+    const icon = ANNOUNCEMENT_ICONS[data.type] || ANNOUNCEMENT_ICONS.announcement;
+    item.querySelector('h6 i').className = `bi ${icon}`;
+    item.querySelector('h6 span').textContent = data.title;
+    item.querySelector('small.text-muted').textContent = data.date;
+    item.querySelector('p').textContent = `${data.excerpt}...`;
+    item.querySelector('.badge').textContent = data.type.charAt(0).toUpperCase() + data.type.slice(1);
+    return item;
+}
+
+// Background jobs
+function startJob(button, panel) {
+    button.disabled = true;
+    fetch(button.dataset.jobStart, { method: 'POST', headers: { 'Accept': 'application/json' } })
+        .then(response => response.json())
+        .then(data => {
+            if (data.error) {
+                throw new Error(data.error);
+            }
+            panel.classList.remove('d-none');
+            pollJob(data.status_url, job => renderJobProgress(panel, job))
+                .catch(err => {
+                    panel.querySelector('.progress-bar').classList.add('bg-danger');
+                    panel.querySelector('.job-message').textContent = err.message;
+                })
+                .finally(() => { button.disabled = false; });
+        })
+        .catch(err => {
+            button.disabled = false;
+            alert(err.message);
+        });
+}
+
+function pollJob(url, onUpdate, interval = 1000, queuedTimeout = 60000) {
+    const started = Date.now();
+    return new Promise((resolve, reject) => {
+        const poll = () => {
+            fetch(url, { headers: { 'Accept': 'application/json' } })
+                .then(response => response.json())
+                .then(job => {
+                    onUpdate(job);
+                    if (job.status === 'succeeded' || job.status === 'failed') {
+                        resolve(job);
+                    } else if (job.status === 'queued' && job.attempts === 0 && Date.now() - started > queuedTimeout) {
+                        // Never picked up: most likely no job worker is running
+                        reject(new Error('This job has not started yet. Please try again later or contact an administrator.'));
+                    } else {
+                        setTimeout(poll, interval);
+                    }
+                })
+                .catch(reject);
+        };
+        poll();
+    });
+}
+
+function renderJobProgress(panel, job) {
+    const bar = panel.querySelector('.progress-bar');
+    const message = panel.querySelector('.job-message');
+    bar.style.width = `${job.progress}%`;
+    bar.classList.toggle('bg-danger', job.status === 'failed');
+    message.textContent = job.message || job.status.charAt(0).toUpperCase() + job.status.slice(1);
+    if (job.status === 'succeeded' && job.result) {
+        bar.classList.remove('progress-bar-animated');
+        message.textContent = `Average attendance ${job.result.average}% across ${job.result.students.length} students`;
+    }
+}
+
+// Attendance logs: fetch pages on demand and render only the visible rows
+const LOG_STATUS_BADGES = {
+    present: '<span class="badge bg-success"><i class="bi bi-check-circle"></i> Present</span>',
+    absent: '<span class="badge bg-danger"><i class="bi bi-x-circle"></i> Absent</span>'
+};
+
+class AttendanceLogTable {
+    constructor(container, rowHeight = 41, overscan = 10) {
+        this.container = container;
+        this.url = container.dataset.attendanceLogs;
+        this.perPage = parseInt(container.dataset.perPage, 10) || 100;
+        this.rowHeight = rowHeight;
+        this.overscan = overscan;
+        this.tbody = container.querySelector('tbody');
+        this.columns = container.querySelectorAll('thead th').length;
+        this.card = container.closest('.card-body');
+        this.filter = document.querySelector(container.dataset.filter);
+        this.pages = new Map();
+        this.total = 0;
+        this.complete = false;
+        this.frame = null;
+        this.generation = 0;
+        this.printing = false;
+
+        container.addEventListener('scroll', () => this.scheduleRender());
+        const printButton = container.closest('.card').querySelector('[data-log-print]');
+        if (printButton) {
+            printButton.addEventListener('click', () => this.print());
+        }
+        window.addEventListener('afterprint', () => {
+            if (this.printing) {
+                this.printing = false;
+                this.render();
+            }
+        });
+        if (this.filter) {
+            this.filter.addEventListener('submit', e => {
+                e.preventDefault();
+                this.load();
+            });
+        }
+    }
+
+    load() {
+        // Responses still in flight for the previous filter are discarded
+        const generation = ++this.generation;
+        this.pages.clear();
+        this.total = 0;
+        this.complete = false;
+        this.container.scrollTop = 0;
+        return this.fetchPage(1).then(() => {
+            if (generation === this.generation) {
+                this.render();
+            }
+        });
+    }
+
+    fetchPage(page) {
+        if (this.pages.has(page)) {
+            return this.pages.get(page);
+        }
+        const params = new URLSearchParams({ page: page, per_page: this.perPage });
+        if (this.filter) {
+            new FormData(this.filter).forEach((value, key) => {
+                if (value) {
+                    params.set(key, value);
+                }
+            });
+        }
+        const generation = this.generation;
+        const request = fetch(`${this.url}?${params}`, { headers: { 'Accept': 'application/json' } })
+            .then(response => response.json())
+            .then(data => {
+                if (generation !== this.generation) {
+                    return [];
+                }
+                if (!this.complete) {
+                    // Until a page reports the end, keep one placeholder row past
+                    // the known rows so scrolling to it fetches the next page
+                    this.complete = !data.has_more;
+                    this.total = data.has_more ? Math.max(this.total, data.total + 1) : data.total;
+                }
+                const rows = data.rows.map(row => Object.fromEntries(data.fields.map((field, i) => [field, row[i]])));
+                this.pages.set(page, rows);
+                return rows;
+            })
+            .catch(err => {
+                if (generation === this.generation) {
+                    this.pages.delete(page);
+                }
+                console.error('Failed to load attendance logs:', err);
+                return [];
+            });
+        this.pages.set(page, request);
+        return request;
+    }
+
+    print() {
+        // Load every page of the current filter in turn (the total grows as
+        // pages arrive), render all rows, then print
+        const generation = this.generation;
+        const logs = [];
+        const loadFrom = page => Promise.resolve(this.fetchPage(page)).then(rows => {
+            if (generation !== this.generation) {
+                return false;
+            }
+            logs.push(...rows);
+            return page * this.perPage < this.total ? loadFrom(page + 1) : true;
+        });
+        return loadFrom(1).then(current => {
+            if (!current) {
+                return;
+            }
+            this.printing = true;
+            this.tbody.innerHTML = logs.map((log, index) => this.logRow(index, log)).join('');
+            window.print();
+        });
+    }
+
+    scheduleRender() {
+        if (this.printing) {
+            return;
+        }
+        if (this.frame === null) {
+            this.frame = requestAnimationFrame(() => {
+                this.frame = null;
+                this.render();
+            });
+        }
+    }
+
+    render() {
+        const count = this.card.querySelector('[data-log-count]');
+        if (count) {
+            count.textContent = this.complete ? `${this.total} records` : `${this.total - 1}+ records`;
+        }
+        this.card.querySelector('[data-log-empty]').classList.toggle('d-none', this.total > 0);
+        this.container.classList.toggle('d-none', this.total === 0);
+
+        const visible = Math.ceil(this.container.clientHeight / this.rowHeight);
+        const first = Math.max(0, Math.floor(this.container.scrollTop / this.rowHeight) - this.overscan);
+        const last = Math.min(this.total, first + visible + this.overscan * 2);
+
+        const missing = [];
+        const rows = [];
+        for (let index = first; index < last; index++) {
+            const page = Math.floor(index / this.perPage) + 1;
+            const loaded = this.pages.get(page);
+            if (!Array.isArray(loaded)) {
+                if (!missing.includes(page)) {
+                    missing.push(page);
+                }
+                rows.push(this.placeholderRow(index));
+            } else {
+                rows.push(this.logRow(index, loaded[index % this.perPage]));
+            }
+        }
+        missing.forEach(page => this.fetchPage(page).then(() => this.scheduleRender()));
+
+        const top = first * this.rowHeight;
+        const bottom = (this.total - last) * this.rowHeight;
+        this.tbody.innerHTML = this.spacerRow(top) + rows.join('') + this.spacerRow(bottom);
+    }
+
+    spacerRow(height) {
+        return height > 0 ? `<tr class="virtual-spacer" style="height: ${height}px"><td colspan="${this.columns}"></td></tr>` : '';
+    }
+
+    placeholderRow(index) {
+        return `<tr><td>${index + 1}</td><td colspan="${this.columns - 1}" class="text-muted">Loading...</td></tr>`;
+    }
+
+    logRow(index, log) {
+        if (!log) {
+            return this.placeholderRow(index);
+        }
+        const status = log.status || '';
+        const badge = LOG_STATUS_BADGES[status] ||
+            `<span class="badge bg-warning"><i class="bi bi-dash-circle"></i> ${escapeHtml(status.charAt(0).toUpperCase() + status.slice(1))}</span>`;
+        return `<tr>
+            <td>${index + 1}</td>
+            <td>${escapeHtml(log.date)}</td>
+            <td>${escapeHtml(log.day)}</td>
+            <td>${badge}</td>
+            <td>${escapeHtml(log.time_in || '-')}</td>
+            <td>${escapeHtml(log.time_out || '-')}</td>
+            <td>${escapeHtml(log.remarks || '-')}</td>
+        </tr>`;
+    }
+}
+
+function escapeHtml(value) {
+    return String(value ?? '').replace(/[&<>"']/g, c => ({
+        '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+    })[c]);
+}
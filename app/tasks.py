@@ -0,0 +1,35 @@
+from datetime import datetime
+from app.jobs import job, report_progress
+from app.models import User
+from app.routes.student import fetch_attendance_data
+
+
+@job('reports.department_attendance')
+def department_attendance_report(job, department_id):
+    """Collect every active student's attendance summary for a department."""
+    students = User.query.filter_by(
+        department_id=department_id,
+        role='student',
+        is_active=True
+    ).order_by(User.full_name).all()
+    
+    rows = []
+    for index, student in enumerate(students, 1):
+        data = fetch_attendance_data(student.student_id)
+        rows.append({
+            'student_id': student.student_id,
+            'name': student.full_name,
+            'percentage': data.get('percentage', 0),
+            'present_days': data.get('present_days', 0),
+            'absent_days': data.get('absent_days', 0)
+        })
+        if index % 10 == 0 or index == len(students):
+            report_progress(job, index * 100 / len(students), f'{index} of {len(students)} students')
+    
+    average = round(sum(row['percentage'] for row in rows) / len(rows), 1) if rows else 0
+    return {
+        'department_id': department_id,
+        'generated_at': datetime.utcnow().isoformat(),
+        'average': average,
+        'students': rows
+    }
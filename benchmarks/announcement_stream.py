@@ -0,0 +1,143 @@
+"""Capacity benchmark for the announcement stream against a running server.
+
+Logs in, opens ``--connections`` concurrent ``/announcements/stream``
+connections in steps of ``--step`` and, after each step, reports the
+server's resident memory per open stream and the latency of an ordinary
+request. It stops at the point where that latency exceeds ``--slowdown``
+times the idle baseline (or a stream fails to open).
+
+Run the server with a single worker so its RSS is easy to attribute, and
+pass that worker's PID (the "Booting worker with pid" line in the log):
+    WEB_CONCURRENCY=1 gunicorn -c gunicorn.conf.py run:app
+    python benchmarks/announcement_stream.py --username student1 --password ... \\
+        --pid <worker pid> --connections 5000
+
+Each gevent worker accepts ``worker_connections`` (gunicorn.conf.py)
+connections at once, streams included, so expect saturation near that.
+"""
+import argparse
+import re
+import resource
+import socket
+import statistics
+import sys
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+
+def login(base_url, username, password):
+    """Return the session cookie header for a logged-in user."""
+    session = requests.Session()
+    page = session.get(f'{base_url}/login', timeout=10)
+    token = re.search(r'name="csrf_token" type="hidden" value="([^"]+)"', page.text)
+    response = session.post(f'{base_url}/login', data={
+        'csrf_token': token.group(1) if token else '',
+        'username': username,
+        'password': password
+    }, allow_redirects=False, timeout=10)
+    if response.status_code != 302 or '/login' in response.headers.get('Location', ''):
+        sys.exit('Login failed; check --username/--password')
+    return '; '.join(f'{c.name}={c.value}' for c in session.cookies)
+
+
+def open_stream(host, port, path, cookie, timeout):
+    """Open one SSE connection and wait for the server's first frame."""
+    sock = socket.create_connection((host, port), timeout=timeout)
+    sock.sendall((f'GET {path} HTTP/1.1\r\nHost: {host}\r\nCookie: {cookie}\r\n'
+                  'Accept: text/event-stream\r\n\r\n').encode())
+    received = b''
+    while b'retry:' not in received:
+        chunk = sock.recv(4096)
+        if not chunk:
+            raise ConnectionError('stream closed before the first frame')
+        received += chunk
+    if not received.startswith(b'HTTP/1.1 200'):
+        raise ConnectionError(received.split(b'\r\n', 1)[0].decode())
+    return sock
+
+
+def rss_kb(pids):
+    """Combined resident set size of the server processes, in kB."""
+    total = 0
+    for pid in pids:
+        with open(f'/proc/{pid}/status') as f:
+            total += int(re.search(r'VmRSS:\s+(\d+)', f.read()).group(1))
+    return total
+
+
+def probe(url, samples):
+    """Median latency in ms of a plain request on a fresh connection."""
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        requests.get(url, timeout=10).raise_for_status()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--username', required=True, help='Student or parent account')
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--pid', type=int, action='append', default=[],
+                        help='Server worker PID to measure (repeatable)')
+    parser.add_argument('--connections', type=int, default=2000)
+    parser.add_argument('--step', type=int, default=250)
+    parser.add_argument('--probe-path', default='/health')
+    parser.add_argument('--samples', type=int, default=5)
+    parser.add_argument('--slowdown', type=float, default=2.0)
+    args = parser.parse_args()
+
+    # Each stream is one client socket
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    base_url = args.url.rstrip('/')
+    parts = urlsplit(base_url)
+    host, port = parts.hostname, parts.port or 80
+    cookie = login(base_url, args.username, args.password)
+    probe_url = f'{base_url}{args.probe_path}'
+
+    baseline_rss = rss_kb(args.pid) if args.pid else None
+    baseline = probe(probe_url, args.samples)
+    print(f'Idle: probe {baseline:.1f} ms' + (f', RSS {baseline_rss / 1024:.1f} MB' if args.pid else ''))
+    print(f'{"streams":>8} {"RSS MB":>8} {"KB/stream":>10} {"probe ms":>9}')
+
+    streams = []
+    saturated = None
+    while len(streams) < args.connections and saturated is None:
+        target = min(len(streams) + args.step, args.connections)
+        try:
+            while len(streams) < target:
+                streams.append(open_stream(host, port, '/announcements/stream', cookie, timeout=30))
+        except (OSError, ConnectionError) as exc:
+            saturated = f'stream {len(streams) + 1} failed to open: {exc}'
+        try:
+            latency = probe(probe_url, args.samples)
+        except requests.RequestException as exc:
+            latency = None
+            saturated = saturated or f'ordinary request failed: {exc.__class__.__name__}'
+        line = f'{len(streams):>8}'
+        if args.pid:
+            rss = rss_kb(args.pid)
+            line += f' {rss / 1024:>8.1f} {(rss - baseline_rss) / max(len(streams), 1):>10.1f}'
+        else:
+            line += f' {"-":>8} {"-":>10}'
+        print(f'{line} {latency:>9.1f}' if latency is not None else f'{line} {"-":>9}')
+        if saturated is None and latency > baseline * args.slowdown:
+            saturated = f'probe latency {latency:.1f} ms exceeds {args.slowdown}x the idle {baseline:.1f} ms'
+
+    if saturated:
+        print(f'Saturation at {len(streams)} open streams: {saturated}')
+    else:
+        print(f'No slowdown up to {len(streams)} open streams')
+
+    for sock in streams:
+        sock.close()
+
+
+if __name__ == '__main__':
+    main()
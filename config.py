@@ -22,15 +22,36 @@ class Config:
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt', 'jpg', 'jpeg', 'png'}
 
+    # Real-time announcement stream (Server-Sent Events)
+    # Leave unset for in-process fan-out; use redis://... to share events across workers
+    ANNOUNCEMENT_BROKER_URL = os.environ.get('ANNOUNCEMENT_BROKER_URL') or os.environ.get('REDIS_URL')
+    ANNOUNCEMENT_BROKER_REQUIRED = False  # refuse the in-process fallback
+    ANNOUNCEMENT_STREAM_BACKLOG = 20  # events buffered per idle subscriber
+    ANNOUNCEMENT_STREAM_KEEPALIVE = 15  # seconds between keep-alive comments
+    ANNOUNCEMENT_STREAM_TIMEOUT = 300  # seconds before the client is asked to reconnect
+    DEPARTMENT_TIMELINE_SIZE = 20  # announcements cached per department feed
+    
+    # Background jobs (run with `flask jobs work`)
+    JOB_POLL_INTERVAL = 1.0  # seconds an idle worker waits before polling again
+    JOB_MAX_ATTEMPTS = 3
+    JOB_RETRY_DELAY = 10  # seconds before the first retry, doubled each attempt
+    JOB_TIMEOUT = 600  # seconds without a heartbeat before a running job is presumed dead
+    
+    # Static asset pipeline (build with `flask assets build`)
+    ASSET_SOURCES = ['css/style.css', 'js/main.js']
+    USE_ASSET_MANIFEST = True  # serve fingerprinted builds from static/dist when present
+
 class DevelopmentConfig(Config):
     """Development configuration."""
     DEBUG = True
     TESTING = False
+    USE_ASSET_MANIFEST = False  # edits to static files show up without rebuilding
 
 class ProductionConfig(Config):
     """Production configuration."""
     DEBUG = False
     TESTING = False
+    ANNOUNCEMENT_BROKER_REQUIRED = True  # multiple Gunicorn workers need Redis fan-out
 
 class TestingConfig(Config):
     """Testing configuration."""
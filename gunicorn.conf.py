@@ -0,0 +1,19 @@
+import os
+
+# Server socket
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# Worker processes
+# gevent workers: each open announcement stream (SSE) is a greenlet rather than
+# an OS thread, so thousands of idle dashboards do not exhaust request slots
+workers = int(os.environ.get('WEB_CONCURRENCY', 3))
+worker_class = 'gevent'
+worker_connections = 2000
+timeout = 30
+keepalive = 2
+
+
+def post_fork(server, worker):
+    """Make psycopg2 cooperative so database calls yield to other greenlets."""
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()